@@ -0,0 +1,45 @@
+"""
+Kernel similarity terkompilasi Numba untuk fallback tanpa RapidFuzz
+Dipakai processor.py jika rapidfuzz tidak terpasang tetapi numba tersedia
+"""
+
+import numpy as np
+from numba import njit
+
+
+@njit(cache=True)
+def _lcs_length(s1: np.ndarray, s2: np.ndarray) -> int:
+    """Panjang longest common subsequence (Wagner-Fischer, satu baris DP)"""
+    n = s1.shape[0]
+    m = s2.shape[0]
+    row = np.zeros(m + 1, dtype=np.int32)
+    for i in range(n):
+        diagonal = 0  # nilai row[j] dari baris sebelumnya
+        for j in range(m):
+            above = row[j + 1]
+            if s1[i] == s2[j]:
+                row[j + 1] = diagonal + 1
+            elif row[j] > above:
+                row[j + 1] = row[j]
+            diagonal = above
+    return row[m]
+
+
+@njit(cache=True)
+def indel_ratio(s1: np.ndarray, s2: np.ndarray) -> float:
+    """
+    Similarity 0.0 - 1.0 dari dua array code point
+
+    Setara fuzz.ratio / 100 milik RapidFuzz: 1 - indel_distance / (n + m)
+    = 2 * LCS / (n + m), sehingga threshold dan batas panjang yang sama
+    berlaku di jalur RapidFuzz maupun fallback ini.
+    """
+    total = s1.shape[0] + s2.shape[0]
+    if total == 0:
+        return 1.0
+    return 2.0 * _lcs_length(s1, s2) / total
+
+
+def encode(text: str) -> np.ndarray:
+    """Ubah string menjadi array code point (UTF-32) untuk kernel numba"""
+    return np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32)
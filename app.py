@@ -4,27 +4,28 @@ Streamlit app for converting vendor RAB files to SOSYS format with AI-powered fu
 """
 
 import streamlit as st
-import pandas as pd
+import numpy as np
 from datetime import datetime
 
 # Import custom modules
 from config import (
     APP_TITLE, APP_ICON, APP_LAYOUT, 
     DEFAULT_COLUMNS, DEFAULT_SKIP_ROWS, MAX_SKIP_ROWS,
-    KOLOM_OPTIONS, COLUMN_HELP, COLUMN_LABELS,
-    NUMERIC_COLUMNS, UI_TEXT
+    KOLOM_OPTIONS, HURUF_TO_INT, COLUMN_HELP, COLUMN_LABELS,
+    NUMERIC_COLUMNS, FUZZY_SCORER, UI_TEXT
 )
 from styles import get_custom_css
 from ui_components import (
     render_header, render_step_card, render_statistics, 
     render_footer, create_download_section,
-    prepare_dataframe_for_display, get_column_config
+    prepare_dataframe_for_display, get_column_config, dataframe_hash,
+    unmatched_material_mask
 )
 from data_handlers import (
-    process_master_data, get_visible_sheets, 
+    process_master_data, get_visible_sheets, read_vendor_sheet,
     update_material_codes, validate_column_selection
 )
-from processor import huruf_ke_angka, proses_data_vendor
+from processor import proses_data_vendor
 
 
 # ==================== PAGE CONFIGURATION ====================
@@ -47,6 +48,14 @@ if 'master_uploaded' not in st.session_state:
     st.session_state['master_uploaded'] = False
 if 'master_success_message' not in st.session_state:
     st.session_state['master_success_message'] = None
+# Bumped whenever the result table content changes (new result, edit, auto-update)
+if 'df_version' not in st.session_state:
+    st.session_state['df_version'] = 0
+
+
+def bump_df_version():
+    """Mark the result table as changed so its download hash is recomputed"""
+    st.session_state['df_version'] += 1
 
 
 # ==================== MAIN UI ====================
@@ -187,19 +196,20 @@ if st.session_state['master_uploaded']:
         
         if btn_proses:
             try:
-                # Read vendor file
-                df_v = pd.read_excel(uploaded_vendor, sheet_name=sheet_name, skiprows=skip_rows, header=None)
-                
                 # Build configuration
                 config = {
-                    'c_uraian': huruf_ke_angka(h_uraian),
-                    'c_mat': huruf_ke_angka(h_mat),
-                    'c_psg': huruf_ke_angka(h_psg),
-                    'c_bkr': huruf_ke_angka(h_bkr),
-                    'c_satuan': huruf_ke_angka(h_satuan),
-                    'c_total': huruf_ke_angka(h_total)
+                    'c_uraian': HURUF_TO_INT[h_uraian],
+                    'c_mat': HURUF_TO_INT[h_mat],
+                    'c_psg': HURUF_TO_INT[h_psg],
+                    'c_bkr': HURUF_TO_INT[h_bkr],
+                    'c_satuan': HURUF_TO_INT[h_satuan],
+                    'c_total': HURUF_TO_INT[h_total],
+                    'fuzzy_scorer': FUZZY_SCORER
                 }
                 
+                # Read vendor file (only up to the last configured column)
+                df_v = read_vendor_sheet(uploaded_vendor, sheet_name, skip_rows, config)
+                
                 # Validate columns
                 is_valid, error_msg = validate_column_selection(config, df_v.shape)
                 if not is_valid:
@@ -217,7 +227,7 @@ if st.session_state['master_uploaded']:
                     st.warning("Tidak ada data yang memenuhi kriteria filter")
                 else:
                     st.session_state['df_hasil'] = df_hasil
-                    matched = (df_hasil['Kode Material'] != '-').sum()
+                    bump_df_version()
                     st.success(f"Berhasil memproses **{len(df_hasil)}** material!")
                 
             except Exception as e:
@@ -236,7 +246,8 @@ if st.session_state['df_hasil'] is not None:
     render_statistics(df_stats)
     
     # Filter options
-    unmatched = (df_stats['Kode Material'] == '-').sum()
+    unmatched_mask = unmatched_material_mask(df_stats['Kode Material'])
+    unmatched = np.count_nonzero(unmatched_mask)
     if unmatched > 0:
         show_unmatched = st.checkbox(
             f"Show only unmatched materials ({unmatched} items)",
@@ -245,13 +256,15 @@ if st.session_state['df_hasil'] is not None:
     else:
         show_unmatched = False
     
-    # Prepare data for display
-    df_vendor_view = st.session_state['df_hasil'].copy()
-    
+    # Prepare data for display. df_stats lives in session state, so it is copied;
+    # the unmatched subset from take() is already a new frame and is prepared in place
     if show_unmatched:
-        df_vendor_view = df_vendor_view[df_vendor_view['Kode Material'] == '-']
-    
-    df_vendor_view = prepare_dataframe_for_display(df_vendor_view, NUMERIC_COLUMNS)
+        unmatched_rows = np.flatnonzero(unmatched_mask)
+        df_vendor_view = prepare_dataframe_for_display(
+            df_stats.take(unmatched_rows), NUMERIC_COLUMNS, copy=False
+        )
+    else:
+        df_vendor_view = prepare_dataframe_for_display(df_stats, NUMERIC_COLUMNS)
     
     # Data editor
     st.markdown(f"### <i class='fas fa-solid fa-table-list'></i> Data Hasil Konversi: {display_name}", unsafe_allow_html=True)
@@ -262,7 +275,8 @@ if st.session_state['df_hasil'] is not None:
         key=f"editor_vendor_{display_name}",
         width='stretch',
         column_config=get_column_config(),
-        hide_index=True
+        hide_index=True,
+        on_change=bump_df_version
     )
     
     st.markdown("""
@@ -279,12 +293,17 @@ if st.session_state['df_hasil'] is not None:
     # Update session state and rerun if changes occurred
     if perubahan_terjadi:
         st.session_state['df_hasil'] = edited_df
+        bump_df_version()
         st.rerun()
     else:
         st.session_state['df_hasil'] = edited_df
     
-    # Download section
-    create_download_section(edited_df, display_name)
+    # Download section: reuse the content hash until the table (or the view) changes
+    download_key = (st.session_state['df_version'], show_unmatched, display_name)
+    if st.session_state.get('download_hash_key') != download_key:
+        st.session_state['download_hash'] = dataframe_hash(edited_df)
+        st.session_state['download_hash_key'] = download_key
+    create_download_section(edited_df, display_name, st.session_state['download_hash'])
 
 
 # ==================== FOOTER ====================
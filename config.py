@@ -34,6 +34,9 @@ KOLOM_HURUF = ['A', 'B', 'C', 'D', 'E', 'F', 'G', 'H', 'I', 'J', 'K', 'L', 'M',
                'N', 'O', 'P', 'Q', 'R', 'S', 'T', 'U', 'V', 'W', 'X', 'Y', 'Z']
 KOLOM_OPTIONS = KOLOM_HURUF + [f'A{c}' for c in KOLOM_HURUF]
 
+# Column letter -> 0-based index (same result as processor.huruf_ke_angka)
+HURUF_TO_INT = {huruf: i for i, huruf in enumerate(KOLOM_OPTIONS)}
+
 # ==================== PROCESSING CONFIGURATION ====================
 # Default skip rows for vendor file
 DEFAULT_SKIP_ROWS = 6
@@ -42,6 +45,10 @@ MAX_SKIP_ROWS = 50
 # Fuzzy matching threshold (0.0 - 1.0)
 FUZZY_THRESHOLD = 0.8
 
+# Fuzzy matching scorer (see processor.FUZZY_SCORERS):
+# 'ratio', 'levenshtein', 'wratio' or 'token_set_ratio'
+FUZZY_SCORER = 'ratio'
+
 # ==================== OUTPUT CONFIGURATION ====================
 # Columns in the final output DataFrame
 OUTPUT_COLUMNS = [
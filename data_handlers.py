@@ -3,47 +3,80 @@ Data Handlers for SOSYS Material Automation
 Functions for loading, validating, and processing data files
 """
 
+import io
+import zipfile
 import pandas as pd
-import openpyxl
+import numpy as np
 import streamlit as st
-from typing import Dict, Tuple, List, Optional
-from processor import load_master_from_dataframe, clear_fuzzy_cache, fuzzy_match_material
-from config import CSV_ENCODINGS, REQUIRED_MASTER_COLUMNS
+from xml.etree import ElementTree
+from typing import Any, Dict, Tuple, List, Optional
+from processor import load_master_from_dataframe, clear_fuzzy_cache, fuzzy_match_batch, get_master_index
+from config import CSV_ENCODINGS, REQUIRED_MASTER_COLUMNS, FUZZY_SCORER
 
 
-def load_master_file(uploaded_file) -> Tuple[Optional[pd.DataFrame], Optional[str]]:
+def _read_csv_pyarrow(uploaded_file) -> Optional[pd.DataFrame]:
+    """
+    Read a semicolon-separated UTF-8 CSV with the multithreaded pyarrow engine
+    
+    Args:
+        uploaded_file: File-like object positioned at the start
+    
+    Returns:
+        DataFrame, or None if the file is not valid UTF-8 / not parseable by pyarrow
+    """
+    try:
+        df = pd.read_csv(uploaded_file, sep=';', engine='pyarrow')
+    except (ImportError, ValueError):
+        return None
+    
+    # Invalid UTF-8 in the data comes back as raw bytes instead of an error
+    for col in df.columns:
+        if df[col].dtype == object and pd.api.types.infer_dtype(df[col], skipna=True) == 'bytes':
+            return None
+    
+    # Missing strings come back as None; use NaN like the C parser
+    return df.fillna(np.nan)
+
+
+def load_master_file(uploaded_file, file_name: Optional[str] = None) -> Tuple[Optional[pd.DataFrame], Optional[str]]:
     """
     Load master file (Excel or CSV) and validate columns
     
     Args:
-        uploaded_file: Streamlit uploaded file object
+        uploaded_file: Streamlit uploaded file object (or any file-like object)
+        file_name: File name used to detect the format; defaults to uploaded_file.name
     
     Returns:
         Tuple of (DataFrame, error_message)
         If successful: (df, None)
         If error: (None, error_message)
     """
+    file_name = file_name or uploaded_file.name
+    
     try:
         # Read file based on extension
-        if uploaded_file.name.endswith('.xlsx'):
+        if file_name.endswith('.xlsx'):
             try:
                 df_master = pd.read_excel(uploaded_file, sheet_name="MASTER MATERIAL")
             except:
                 df_master = pd.read_excel(uploaded_file, sheet_name=0)
         else:
-            # Try multiple encodings for CSV
-            df_master = None
-            for enc in CSV_ENCODINGS:
-                try:
-                    df_master = pd.read_csv(uploaded_file, sep=';', encoding=enc)
-                    break
-                except:
+            df_master = _read_csv_pyarrow(uploaded_file)
+            
+            # Fall back to the C parser with multiple encodings
+            if df_master is None:
+                uploaded_file.seek(0)
+                for enc in CSV_ENCODINGS:
                     try:
-                        uploaded_file.seek(0)
-                        df_master = pd.read_csv(uploaded_file, encoding=enc)
+                        df_master = pd.read_csv(uploaded_file, sep=';', encoding=enc)
                         break
                     except:
-                        continue
+                        try:
+                            uploaded_file.seek(0)
+                            df_master = pd.read_csv(uploaded_file, encoding=enc)
+                            break
+                        except:
+                            continue
             
             if df_master is None:
                 return None, "Failed to read CSV file with any supported encoding"
@@ -77,10 +110,24 @@ def load_master_file(uploaded_file) -> Tuple[Optional[pd.DataFrame], Optional[st
         return None, f"Error loading master file: {str(e)}"
 
 
+# Relationship type suffix of chartsheets in xl/_rels/workbook.xml.rels
+_CHARTSHEET_REL_SUFFIX = '/chartsheet'
+
+
+def _local_name(tag: str) -> str:
+    """Strip the '{namespace}' prefix from an XML tag or attribute name"""
+    return tag.rsplit('}', 1)[-1]
+
+
 def get_visible_sheets(uploaded_file) -> Tuple[Optional[List[str]], Optional[str]]:
     """
     Get list of visible sheets from Excel file
     
+    Only xl/workbook.xml and its relationships are read straight from the
+    zip archive, so listing sheets costs O(number of sheets) regardless of
+    how large the worksheets, shared strings or styles are. Chartsheets are
+    skipped, as openpyxl's wb.worksheets would.
+    
     Args:
         uploaded_file: Streamlit uploaded file object
     
@@ -88,13 +135,25 @@ def get_visible_sheets(uploaded_file) -> Tuple[Optional[List[str]], Optional[str
         Tuple of (sheet_list, error_message)
     """
     try:
-        wb = openpyxl.load_workbook(uploaded_file, read_only=True, keep_vba=False)
-        
-        visible_sheets = [
-            sheet.title for sheet in wb.worksheets 
-            if sheet.sheet_state == 'visible'
-        ]
-        wb.close()
+        with zipfile.ZipFile(uploaded_file) as archive:
+            with archive.open('xl/_rels/workbook.xml.rels') as rels_file:
+                rel_types = {
+                    elem.get('Id'): elem.get('Type', '')
+                    for _, elem in ElementTree.iterparse(rels_file)
+                    if _local_name(elem.tag) == 'Relationship'
+                }
+            
+            visible_sheets = []
+            with archive.open('xl/workbook.xml') as workbook_file:
+                for _, elem in ElementTree.iterparse(workbook_file):
+                    if _local_name(elem.tag) != 'sheet':
+                        continue
+                    
+                    attrs = {_local_name(key): value for key, value in elem.attrib.items()}
+                    if rel_types.get(attrs.get('id'), '').endswith(_CHARTSHEET_REL_SUFFIX):
+                        continue
+                    if attrs.get('state', 'visible') == 'visible':
+                        visible_sheets.append(attrs['name'])
         
         if not visible_sheets:
             return None, "No visible sheets found in the file"
@@ -103,12 +162,44 @@ def get_visible_sheets(uploaded_file) -> Tuple[Optional[List[str]], Optional[str
         
     except Exception as e:
         return None, f"Error reading Excel file: {str(e)}"
+    
+    finally:
+        uploaded_file.seek(0)
+
+
+def read_vendor_sheet(
+    uploaded_file,
+    sheet_name: str,
+    skip_rows: int,
+    config: Optional[Dict[str, Any]] = None
+) -> pd.DataFrame:
+    """
+    Read a vendor sheet into a header-less DataFrame
+    
+    Args:
+        uploaded_file: Streamlit uploaded file object
+        sheet_name: Name of the sheet to read
+        skip_rows: Number of header rows to skip
+        config: Optional column configuration; when given, only columns up to
+            the last configured one are kept in the DataFrame
+    
+    Returns:
+        DataFrame with positional (0-based) column labels
+    """
+    usecols = None
+    if config:
+        max_col = max(value for value in config.values() if isinstance(value, int))
+        # A callable (not a range) so a sheet narrower than the config still
+        # loads and validate_column_selection can report the real width
+        usecols = lambda col: col <= max_col
+    
+    return pd.read_excel(uploaded_file, sheet_name=sheet_name, skiprows=skip_rows, header=None, usecols=usecols)
 
 
 def update_material_codes(edited_df: pd.DataFrame, master_dict: Dict) -> Tuple[pd.DataFrame, bool]:
     """
     Update Kode Material and Tipe Material based on Nama Material changes
-    Uses exact match first, then fuzzy matching
+    Uses exact match first, then batched fuzzy matching for the remaining rows
     
     Args:
         edited_df: DataFrame with potentially edited Nama Material
@@ -117,35 +208,50 @@ def update_material_codes(edited_df: pd.DataFrame, master_dict: Dict) -> Tuple[p
     Returns:
         Tuple of (updated_df, changes_made)
     """
-    perubahan_terjadi = False
+    # Nothing to re-match if the names (and master) are the same as last run
+    names_hash = hash((id(master_dict), tuple(edited_df['Nama Material'])))
+    if st.session_state.get('last_names_hash') == names_hash:
+        return edited_df, False
     
-    for index, row in edited_df.iterrows():
-        nama_input = str(row['Nama Material']).strip()
-        
-        # Skip empty or NaN values
-        if not nama_input or nama_input.lower() == 'nan':
-            continue
-        
-        # Try exact match first
-        if nama_input in master_dict:
-            target_kode = master_dict[nama_input].get('Kode', '-')
-            target_tipe = master_dict[nama_input].get('Tipe', '-')
-        else:
-            # Use fuzzy matching if exact match not found
-            matched_name, score = fuzzy_match_material(nama_input, master_dict, threshold=0.8)
-            
-            if matched_name:
-                target_kode = master_dict[matched_name].get('Kode', '-')
-                target_tipe = master_dict[matched_name].get('Tipe', '-')
-            else:
-                target_kode = '-'
-                target_tipe = '-'
-        
-        # Update if there are differences
-        if row['Kode Material'] != target_kode or row['Tipe Material'] != target_tipe:
-            edited_df.at[index, 'Kode Material'] = target_kode
-            edited_df.at[index, 'Tipe Material'] = target_tipe
-            perubahan_terjadi = True
+    nama = edited_df['Nama Material'].astype(str).str.strip()
+    
+    # Skip empty or NaN values
+    valid = ((nama != '') & (nama.str.lower() != 'nan')).to_numpy()
+    
+    index = get_master_index(master_dict)
+    
+    # Exact match first: position of each name in the master arrays (-1 = not found)
+    positions = nama.map(index.key_to_idx).fillna(-1).to_numpy(dtype=np.int64)
+    
+    # Batched fuzzy matching only for valid names without an exact match
+    fuzzy_mask = valid & (positions < 0)
+    if fuzzy_mask.any():
+        matched_names, _ = fuzzy_match_batch(
+            nama[fuzzy_mask].tolist(), master_dict, threshold=0.8, scorer=FUZZY_SCORER
+        )
+        positions[fuzzy_mask] = [
+            index.key_to_idx[matched] if matched is not None else -1
+            for matched in matched_names
+        ]
+    
+    found = positions >= 0
+    target_kode = np.full(len(positions), '-', dtype=object)
+    target_tipe = np.full(len(positions), '-', dtype=object)
+    target_kode[found] = index.kodes[positions[found]]
+    target_tipe[found] = index.tipes[positions[found]]
+    
+    # Update if there are differences (single vectorized comparison)
+    changed = valid & (
+        (edited_df['Kode Material'].to_numpy() != target_kode)
+        | (edited_df['Tipe Material'].to_numpy() != target_tipe)
+    )
+    perubahan_terjadi = bool(changed.any())
+    
+    if perubahan_terjadi:
+        edited_df.loc[changed, 'Kode Material'] = target_kode[changed]
+        edited_df.loc[changed, 'Tipe Material'] = target_tipe[changed]
+    
+    st.session_state['last_names_hash'] = names_hash
     
     return edited_df, perubahan_terjadi
 
@@ -154,14 +260,43 @@ def process_master_data(uploaded_file) -> Tuple[Optional[Dict], Optional[str], O
     """
     Process master file and convert to dictionary
     
+    Results are cached on the file contents, so re-processing the same
+    file skips parsing and dictionary building entirely.
+    
     Args:
         uploaded_file: Streamlit uploaded file object
     
+    Returns:
+        Tuple of (master_dict, success_message, error_message)
+    """
+    master_dict, success_msg, error_msg = _process_master_bytes(uploaded_file.getvalue(), uploaded_file.name)
+    
+    # Build the normalized fuzzy index now, for the exact dict object that goes
+    # into session_state, so the first vendor match doesn't pay for it
+    if master_dict:
+        index = get_master_index(master_dict)
+        
+        duplicates = len(master_dict) - len(index.choices)
+        if duplicates:
+            success_msg += f" ({duplicates} nama duplikat digabung untuk fuzzy matching)"
+    
+    return master_dict, success_msg, error_msg
+
+
+@st.cache_data(show_spinner=False)
+def _process_master_bytes(file_bytes: bytes, file_name: str) -> Tuple[Optional[Dict], Optional[str], Optional[str]]:
+    """
+    Cached body of process_master_data, keyed on the raw file bytes and name
+    
+    Args:
+        file_bytes: Raw contents of the uploaded master file
+        file_name: Original file name (used to detect Excel vs CSV)
+    
     Returns:
         Tuple of (master_dict, success_message, error_message)
     """
     # Load file
-    df_master, error = load_master_file(uploaded_file)
+    df_master, error = load_master_file(io.BytesIO(file_bytes), file_name)
     if error:
         return None, None, error
     
@@ -171,26 +306,26 @@ def process_master_data(uploaded_file) -> Tuple[Optional[Dict], Optional[str], O
     if not master_dict:
         return None, None, "Database Master Material kosong atau tidak valid"
     
-    # Clear fuzzy matching cache when new master data is loaded
+    # Clear fuzzy matching cache when new master data is loaded (cache miss only)
     clear_fuzzy_cache()
     
     success_msg = f"Database berhasil dimuat! Total data: **{len(master_dict)}** material."
     return master_dict, success_msg, None
 
 
-def validate_column_selection(config: Dict[str, int], df_shape: Tuple[int, int]) -> Tuple[bool, str]:
+def validate_column_selection(config: Dict[str, Any], df_shape: Tuple[int, int]) -> Tuple[bool, str]:
     """
     Validate if selected columns are within DataFrame bounds
     
     Args:
-        config: Dictionary with column indices
+        config: Dictionary with column indices (non-integer options are ignored)
         df_shape: Shape of the DataFrame (rows, cols)
     
     Returns:
         Tuple of (is_valid, error_message)
     """
     max_col_index = df_shape[1] - 1
-    max_col = max(config.values())
+    max_col = max(value for value in config.values() if isinstance(value, int))
     
     if max_col > max_col_index:
         return False, f"Selected column index {max_col} exceeds file columns (max: {max_col_index})"
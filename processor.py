@@ -1,23 +1,39 @@
 import pandas as pd
 import numpy as np
-from typing import Dict, Any, Tuple, Optional
+from typing import Dict, Any, Tuple, Optional, List, NamedTuple, Iterable, Iterator
 import logging
 import re
+import sys
+import math
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from functools import lru_cache
 
 # Try to import rapidfuzz, fallback to difflib if not available
 try:
     from rapidfuzz import fuzz, process
+    from rapidfuzz.distance import Levenshtein
     USE_RAPIDFUZZ = True
+    USE_NUMBA = False
 except ImportError:
     from difflib import SequenceMatcher
     USE_RAPIDFUZZ = False
     import warnings
-    warnings.warn(
-        "rapidfuzz not found, using difflib (slower). "
-        "Install with: pip install rapidfuzz",
-        ImportWarning
-    )
+    # Tier tengah: kernel numba setara fuzz.ratio, jauh lebih cepat dari difflib
+    try:
+        from _lev_numba import indel_ratio, encode as _encode_codepoints
+        USE_NUMBA = True
+    except ImportError:
+        USE_NUMBA = False
+        warnings.warn(
+            "rapidfuzz not found, using difflib (slower). "
+            "Install with: pip install rapidfuzz",
+            ImportWarning
+        )
+
+# Whitespace beruntun (dipakai normalisasi vectorized di pandas)
+_WS_RE = re.compile(r'\s+')
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
@@ -26,10 +42,36 @@ logger = logging.getLogger(__name__)
 # Log optimization status
 if USE_RAPIDFUZZ:
     logger.info("✅ RapidFuzz loaded - using optimized fuzzy matching (10-100x faster)")
+elif USE_NUMBA:
+    logger.info("⚠️ RapidFuzz not found - using numba-compiled ratio (difflib-free fallback)")
 else:
     logger.info("⚠️ RapidFuzz not found - using difflib (slower fallback)")
 
-logger.info("✅ LRU Cache enabled for normalize_text (maxsize=1024) and calculate_similarity (maxsize=2048)")
+logger.info("✅ LRU Cache enabled for normalize_text (maxsize=16384) and calculate_similarity (maxsize=2048)")
+
+# ==================== FUZZY SCORERS ====================
+
+# Nama scorer -> (fungsi scorer RapidFuzz, skor maksimum scorer tersebut)
+# 'ratio': Indel ratio (fuzz.ratio, 0-100)
+# 'levenshtein': Levenshtein ternormalisasi (bit-parallel, 0-1)
+# 'wratio' / 'token_set_ratio': toleran terhadap urutan kata
+#   ("KABEL NYY 2x2.5" vs "2x2.5 KABEL NYY"), 0-100
+# score_cutoff selalu diteruskan ke scorer: RapidFuzz memakainya untuk menolak
+# kandidat lewat batas atas (mis. rasio panjang) sebelum menghitung DP
+if USE_RAPIDFUZZ:
+    FUZZY_SCORERS = {
+        'ratio': (fuzz.ratio, 100.0),
+        'levenshtein': (Levenshtein.normalized_similarity, 1.0),
+        'wratio': (fuzz.WRatio, 100.0),
+        'token_set_ratio': (fuzz.token_set_ratio, 100.0),
+    }
+else:
+    FUZZY_SCORERS = {}
+
+# Toleransi pembulatan float agar skor yang tepat sama dengan threshold
+# (mis. Levenshtein 12/15 = 0.8) tidak tertolak oleh score_cutoff
+SCORE_CUTOFF_EPSILON = 1e-6
+
 
 # ==================== CACHE MANAGEMENT ====================
 
@@ -40,25 +82,39 @@ def clear_fuzzy_cache():
     """
     normalize_text.cache_clear()
     calculate_similarity.cache_clear()
+    _fuzzy_match_normalized.cache_clear()
+    _MASTER_INDEX_CACHE.clear()
     logger.info("🗑️ Fuzzy matching cache cleared")
 
 
-def get_cache_info() -> Dict[str, Any]:
+class CacheInfo(NamedTuple):
+    """Statistik cache fuzzy matching (lihat get_cache_info)"""
+    normalize_text: Any
+    calculate_similarity: Any
+    fuzzy_match: Any
+    master_index: int
+    using_rapidfuzz: bool
+
+
+def get_cache_info() -> CacheInfo:
     """
     Get cache statistics
     
     Returns:
-        Dictionary dengan info cache hits, misses, size
+        CacheInfo dengan info cache hits, misses, size (functools CacheInfo per fungsi)
     """
-    return {
-        'normalize_text': normalize_text.cache_info()._asdict(),
-        'calculate_similarity': calculate_similarity.cache_info()._asdict(),
-        'using_rapidfuzz': USE_RAPIDFUZZ
-    }
+    return CacheInfo(
+        normalize_text=normalize_text.cache_info(),
+        calculate_similarity=calculate_similarity.cache_info(),
+        fuzzy_match=_fuzzy_match_normalized.cache_info(),
+        master_index=len(_MASTER_INDEX_CACHE),
+        using_rapidfuzz=USE_RAPIDFUZZ
+    )
 
 # ==================== FUZZY MATCHING UTILITIES ====================
 
-@lru_cache(maxsize=1024)
+# Cukup besar untuk seluruh nama unik master + vendor, agar tidak terus evict
+@lru_cache(maxsize=16384)
 def normalize_text(text: str) -> str:
     """
     Normalisasi teks untuk fuzzy matching yang lebih baik
@@ -75,16 +131,12 @@ def normalize_text(text: str) -> str:
         >>> normalize_text("  Kabel  NYM  3X2,5  ")
         "kabel nym 3x2,5"
     """
-    if not isinstance(text, str):
-        return ""
-    
-    # Lowercase dan strip whitespace
-    text = text.lower().strip()
-    
-    # Normalize multiple spaces menjadi single space
-    text = re.sub(r'\s+', ' ', text)
+    # Input wajib str (dicek di entry point); assert hanya aktif tanpa -O
+    assert isinstance(text, str), f"normalize_text butuh str, bukan {type(text).__name__}"
     
-    return text
+    # Lowercase, strip, dan normalize multiple spaces menjadi single space
+    # (str.split() tanpa argumen memakai definisi whitespace yang sama dengan \s)
+    return ' '.join(text.lower().split())
 
 
 @lru_cache(maxsize=2048)
@@ -105,10 +157,28 @@ def calculate_similarity(str1: str, str2: str) -> float:
         >>> calculate_similarity("KABEL NYY 2x2.5", "KABEL NYY 2x2,5")
         0.96...
     """
+    if not isinstance(str1, str) or not isinstance(str2, str):
+        return 0.0
+    
     # Normalisasi kedua string
-    s1_norm = normalize_text(str1)
-    s2_norm = normalize_text(str2)
+    return _similarity_normalized(normalize_text(str1), normalize_text(str2))
+
+
+def _similarity_normalized(s1_norm: str, s2_norm: str) -> float:
+    """
+    Similarity score untuk dua string yang SUDAH dinormalisasi
+    
+    Dipakai di loop fallback difflib agar nama master (yang sudah
+    dinormalisasi sekali di MasterIndex) tidak dinormalisasi ulang dan
+    tidak membanjiri LRU cache calculate_similarity dengan N x M pasangan.
     
+    Args:
+        s1_norm: String pertama (hasil normalize_text)
+        s2_norm: String kedua (hasil normalize_text)
+    
+    Returns:
+        Similarity score (0.0 - 1.0)
+    """
     if not s1_norm or not s2_norm:
         return 0.0
     
@@ -120,15 +190,274 @@ def calculate_similarity(str1: str, str2: str) -> float:
     if USE_RAPIDFUZZ:
         # RapidFuzz: 10-100x lebih cepat dari difflib
         return fuzz.ratio(s1_norm, s2_norm) / 100.0
+    elif USE_NUMBA:
+        # Kernel numba dengan skor yang sama seperti fuzz.ratio
+        return indel_ratio(_encode_codepoints(s1_norm), _encode_codepoints(s2_norm))
     else:
         # Fallback ke difflib.SequenceMatcher
         return SequenceMatcher(None, s1_norm, s2_norm).ratio()
 
 
+# ==================== MASTER INDEX ====================
+
+@dataclass(frozen=True, eq=False)
+class MasterIndex:
+    """
+    Struktur pencarian yang diturunkan dari master_dict
+    
+    Dibangun sekali per master data lalu dipakai ulang oleh setiap query,
+    sehingga list kandidat tidak dialokasikan ulang dan nama master tidak
+    dinormalisasi ulang per pencarian.
+    
+    Kode dan Tipe juga disimpan kolumnar (array sejajar dengan posisi key
+    di master_dict) sehingga lookup cukup satu hash ke key_to_idx lalu
+    indexing array, tanpa mengakses dict per material.
+    
+    Attributes:
+        choices: Nama master unik yang sudah dinormalisasi, diurutkan berdasarkan panjang
+        choice_keys: Key asli master_dict untuk tiap posisi di choices
+        choice_lengths: Panjang tiap kandidat (terurut, sejajar dengan choices)
+        kodes: Kode material per key, urutan sama dengan master_dict
+        tipes: Tipe material per key, urutan sama dengan master_dict
+        key_to_idx: Key asli master_dict -> posisi di kodes/tipes
+        bigram_index: Bigram (2 karakter) -> posisi di choices yang mengandungnya
+        sorted_choices: choices diurutkan leksikografis, untuk pencarian prefix
+        sorted_positions: Posisi di choices untuk tiap elemen sorted_choices
+        norm_to_idx: Nama ternormalisasi -> posisi di kodes/tipes (key pertama)
+    
+    Catatan: pencarian prefix saat ini memakai bisect pada sorted_choices.
+    Jika nanti dibutuhkan skor prefix/startswith dengan early termination,
+    trie (mis. marisa-trie) di atas choices bisa menggantikannya.
+    """
+    choices: List[str]
+    choice_keys: List[str]
+    choice_lengths: List[int]
+    kodes: np.ndarray
+    tipes: np.ndarray
+    key_to_idx: Dict[str, int]
+    bigram_index: Dict[str, np.ndarray]
+    sorted_choices: List[str]
+    sorted_positions: List[int]
+    norm_to_idx: Dict[str, int]
+
+
+# Cache index per objek master_dict: id(master_dict) -> (master_dict, MasterIndex)
+# Referensi ke master_dict ikut disimpan agar id tidak dipakai ulang selama entry hidup
+_MASTER_INDEX_CACHE: Dict[int, Tuple[Dict, MasterIndex]] = {}
+MASTER_INDEX_CACHE_SIZE = 8
+
+
+def _build_master_index(master_dict: Dict[str, Dict]) -> MasterIndex:
+    """Bangun MasterIndex dari master_dict"""
+    # Nama yang identik setelah normalisasi cukup jadi satu kandidat fuzzy;
+    # key pertama yang dipertahankan (sama dengan pemenang saat skor seri)
+    unique_norm_to_key: Dict[str, str] = {}
+    for key in master_dict.keys():
+        unique_norm_to_key.setdefault(normalize_text(key), key)
+    normalized = list(unique_norm_to_key.items())
+    
+    # sorted() stabil: kandidat dengan panjang sama tetap dalam urutan master
+    normalized.sort(key=lambda pair: len(pair[0]))
+    lexical_order = sorted(range(len(normalized)), key=lambda position: normalized[position][0])
+    key_to_idx = {key: idx for idx, key in enumerate(master_dict)}
+    
+    return MasterIndex(
+        choices=[norm for norm, _ in normalized],
+        choice_keys=[key for _, key in normalized],
+        choice_lengths=[len(norm) for norm, _ in normalized],
+        kodes=np.array([data.get('Kode', '-') for data in master_dict.values()], dtype=object),
+        tipes=np.array([data.get('Tipe', '-') for data in master_dict.values()], dtype=object),
+        key_to_idx=key_to_idx,
+        bigram_index=_build_bigram_index([norm for norm, _ in normalized]),
+        sorted_choices=[normalized[position][0] for position in lexical_order],
+        sorted_positions=lexical_order,
+        norm_to_idx={norm: key_to_idx[key] for norm, key in unique_norm_to_key.items()}
+    )
+
+
+def _bigrams(text: str) -> set:
+    """Himpunan bigram (potongan 2 karakter berurutan) dari sebuah string"""
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+
+def _build_bigram_index(choices: List[str]) -> Dict[str, np.ndarray]:
+    """Posting list bigram -> posisi kandidat (terurut naik) untuk prefilter fuzzy"""
+    postings: Dict[str, List[int]] = {}
+    for position, choice in enumerate(choices):
+        for bigram in _bigrams(choice):
+            postings.setdefault(bigram, []).append(position)
+    
+    return {bigram: np.array(positions, dtype=np.int32) for bigram, positions in postings.items()}
+
+
+def _bigram_candidates(index: MasterIndex, query: str, lo: int, hi: int) -> Optional[np.ndarray]:
+    """
+    Pilih ~BIGRAM_TOP_K kandidat dengan bigram bersama terbanyak dari index.choices[lo:hi]
+    
+    Prefilter hanya dipakai jika jendela kandidat cukup besar; untuk pool
+    kecil Levenshtein langsung atas semua kandidat sudah murah dan hasilnya
+    pasti optimal.
+    
+    Args:
+        index: MasterIndex
+        query: Query yang sudah dinormalisasi
+        lo, hi: Jendela kandidat dari _length_window
+    
+    Returns:
+        Array posisi kandidat (terurut naik) atau None jika prefilter tidak dipakai
+    """
+    if hi - lo < BIGRAM_PREFILTER_MIN_POOL:
+        return None
+    
+    postings = [index.bigram_index[bigram] for bigram in _bigrams(query) if bigram in index.bigram_index]
+    if not postings:
+        return None
+    
+    # Jumlah bigram bersama per kandidat, hanya di dalam jendela panjang
+    shared = np.bincount(np.concatenate(postings), minlength=len(index.choices))[lo:hi]
+    kth_shared = max(np.partition(shared, -BIGRAM_TOP_K)[-BIGRAM_TOP_K], 1)
+    
+    # Kandidat yang seri dengan peringkat ke-K ikut diambil agar hasil tidak
+    # bergantung pada urutan pemotongan; flatnonzero sudah terurut naik sehingga
+    # kandidat dengan skor seri tetap dimenangkan yang lebih awal
+    return np.flatnonzero(shared >= kth_shared) + lo
+
+
+# Skor query terhadap kandidat yang diawali query (l = L + jumlah karakter tambahan)
+_PREFIX_SCORES = {
+    # Indel/SequenceMatcher: 2L / (L + l)
+    'ratio': lambda L, l: 2 * L / (L + l),
+    # Levenshtein ternormalisasi: 1 - (l - L) / l
+    'levenshtein': lambda L, l: L / l,
+}
+
+
+def _prefix_match(
+    index: MasterIndex,
+    query: str,
+    threshold: float,
+    scorer: str = 'ratio'
+) -> Optional[Tuple[int, float]]:
+    """
+    Shortcut: query adalah awalan dari tepat satu nama master
+    
+    Pengguna yang mengedit Nama Material sering hanya mengetik ulang
+    beberapa karakter awal. Jika awalan itu hanya cocok dengan satu nama
+    master, nama tersebut langsung dipakai tanpa menghitung edit distance
+    (pencarian biner di sorted_choices, O(log M)). Skornya dihitung persis
+    karena jarak antara awalan dan nama lengkap = selisih panjangnya.
+    
+    Args:
+        index: MasterIndex
+        query: Query yang sudah dinormalisasi
+        threshold: Minimum similarity score (0.0 - 1.0)
+        scorer: Nama scorer di FUZZY_SCORERS
+    
+    Returns:
+        Tuple (posisi di index.choices, skor 0-1) atau None jika tidak ada
+        completion unik yang mencapai threshold
+    """
+    if not query or scorer not in _PREFIX_SCORES:
+        return None
+    
+    sorted_choices = index.sorted_choices
+    lo = bisect_left(sorted_choices, query)
+    
+    # Completion unik: hanya satu nama berurutan yang diawali query
+    if lo == len(sorted_choices) or not sorted_choices[lo].startswith(query):
+        return None
+    if lo + 1 < len(sorted_choices) and sorted_choices[lo + 1].startswith(query):
+        return None
+    
+    score = _PREFIX_SCORES[scorer](len(query), len(sorted_choices[lo]))
+    if score < threshold - SCORE_CUTOFF_EPSILON:
+        return None
+    
+    return index.sorted_positions[lo], score
+
+
+# Prefilter bigram: hanya top-K kandidat yang dihitung Levenshtein-nya
+BIGRAM_TOP_K = 20
+BIGRAM_PREFILTER_MIN_POOL = 2000
+
+
+# Batas panjang kandidat (min, max) per scorer untuk query sepanjang L dan threshold t
+_LENGTH_BOUNDS = {
+    # Indel/SequenceMatcher: score <= 2 * min(L, l) / (L + l)
+    'ratio': lambda L, t: (L * t / (2 - t), L * (2 - t) / t),
+    # Levenshtein ternormalisasi: score <= min(L, l) / max(L, l)
+    'levenshtein': lambda L, t: (L * t, L / t),
+}
+
+
+def _length_window(
+    index: MasterIndex,
+    query_length: int,
+    threshold: float,
+    scorer: str = 'ratio'
+) -> Tuple[int, int]:
+    """
+    Rentang posisi kandidat di index.choices yang panjangnya masih bisa mencapai threshold
+    
+    Untuk ratio berbasis Indel/SequenceMatcher berlaku
+    score <= 2 * min(L, l) / (L + l), sehingga kandidat dengan panjang l
+    di luar [L*t/(2-t), L*(2-t)/t] pasti gagal tanpa perlu dihitung.
+    Untuk Levenshtein ternormalisasi jendelanya [L*t, L/t].
+    
+    Args:
+        index: MasterIndex
+        query_length: Panjang query (L)
+        threshold: Minimum similarity score (t, 0.0 - 1.0)
+        scorer: Nama scorer di FUZZY_SCORERS
+    
+    Returns:
+        Tuple (lo, hi) untuk slicing index.choices[lo:hi]
+    """
+    if threshold <= 0 or scorer not in _LENGTH_BOUNDS:
+        return 0, len(index.choices)
+    
+    lower, upper = _LENGTH_BOUNDS[scorer](query_length, threshold)
+    min_length = math.ceil(lower - 1e-9)
+    max_length = math.floor(upper + 1e-9)
+    
+    return (
+        bisect_left(index.choice_lengths, min_length),
+        bisect_right(index.choice_lengths, max_length)
+    )
+
+
+def get_master_index(master_dict: Dict[str, Dict]) -> MasterIndex:
+    """
+    Ambil MasterIndex untuk master_dict, dibangun hanya saat pertama kali dipakai
+    
+    Index di-cache berdasarkan identitas objek master_dict. Jika isi
+    master_dict diubah in-place, panggil clear_fuzzy_cache().
+    
+    Args:
+        master_dict: Dictionary master material
+    
+    Returns:
+        MasterIndex untuk master_dict tersebut
+    """
+    cached = _MASTER_INDEX_CACHE.get(id(master_dict))
+    if cached is not None and cached[0] is master_dict:
+        return cached[1]
+    
+    index = _build_master_index(master_dict)
+    
+    # Buang entry tertua jika cache penuh
+    if len(_MASTER_INDEX_CACHE) >= MASTER_INDEX_CACHE_SIZE:
+        _MASTER_INDEX_CACHE.pop(next(iter(_MASTER_INDEX_CACHE)))
+    _MASTER_INDEX_CACHE[id(master_dict)] = (master_dict, index)
+    
+    return index
+
+
 def fuzzy_match_material(
     material_name: str, 
     master_dict: Dict[str, Dict], 
-    threshold: float = 0.8
+    threshold: float = 0.8,
+    scorer: str = 'ratio'
 ) -> Tuple[Optional[str], Optional[float]]:
     """
     Cari material terbaik dari master menggunakan fuzzy matching dengan RapidFuzz
@@ -137,11 +466,19 @@ def fuzzy_match_material(
     - Menggunakan rapidfuzz.process.extractOne untuk performa optimal
     - Fallback ke manual iteration jika rapidfuzz tidak tersedia
     - Cached normalization untuk speed boost
+    - List kandidat master dibangun sekali per master (MasterIndex)
+    - Query yang merupakan awalan unik dari satu nama master langsung dikembalikan
+    - Prefilter panjang string sebelum menghitung Levenshtein
+    - Untuk master besar, prefilter bigram: hanya top-K kandidat yang dihitung
+    - Query yang dinormalisasi dicocokkan dengan nama master yang juga
+      sudah dinormalisasi (sekali saat index dibangun)
     
     Args:
         material_name: Nama material dari vendor
         master_dict: Dictionary master material
         threshold: Minimum similarity score (0.0 - 1.0)
+        scorer: Nama scorer di FUZZY_SCORERS ('ratio' atau 'levenshtein');
+            diabaikan pada fallback difflib
     
     Returns:
         Tuple (matched_name, similarity_score) atau (None, None) jika tidak ada match
@@ -151,25 +488,102 @@ def fuzzy_match_material(
         >>> fuzzy_match_material("kabel nyy 2x2,5", master, 0.8)
         ("KABEL NYY 2x2.5", 0.96)
     """
-    if not material_name or not master_dict:
+    if not material_name or not isinstance(material_name, str) or not master_dict:
         return None, None
     
-    # Normalize input
-    normalized_input = normalize_text(material_name)
+    # Normalize input; hasil di-cache per (query ternormalisasi, master, threshold, scorer)
+    return _fuzzy_match_normalized(
+        normalize_text(material_name),
+        get_master_index(master_dict),
+        threshold,
+        scorer
+    )
+
+
+@lru_cache(maxsize=8192)
+def _fuzzy_match_normalized(
+    normalized_input: str,
+    index: MasterIndex,
+    threshold: float,
+    scorer: str
+) -> Tuple[Optional[str], Optional[float]]:
+    """
+    Inti fuzzy_match_material untuk query yang sudah dinormalisasi
+    
+    Di-cache dengan LRU: "Kabel NYY" dan "kabel  nyy" berbagi satu slot
+    karena key-nya query ternormalisasi. MasterIndex di-hash berdasarkan
+    identitas sehingga berfungsi sebagai token master; cache dikosongkan
+    oleh clear_fuzzy_cache() saat master baru dimuat.
+    """
+    effective_scorer = scorer if USE_RAPIDFUZZ else 'ratio'
+    
+    # Awalan unik dari satu nama master: skornya hanya batas bawah (kandidat
+    # lain bisa lebih mirip), jadi dipakai untuk menaikkan threshold pencarian
+    prefix_hit = _prefix_match(index, normalized_input, threshold, effective_scorer)
+    if prefix_hit is None:
+        return _best_in_window(normalized_input, index, threshold, scorer, effective_scorer)
+    
+    matched_name, score = _best_in_window(
+        normalized_input, index, max(threshold, prefix_hit[1]), scorer, effective_scorer
+    )
+    if matched_name is None:
+        # Kandidat prefix tersaring prefilter bigram: tetap match yang valid
+        return index.choice_keys[prefix_hit[0]], prefix_hit[1]
+    return matched_name, score
+
+
+def _best_in_window(
+    normalized_input: str,
+    index: MasterIndex,
+    threshold: float,
+    scorer: str,
+    effective_scorer: str
+) -> Tuple[Optional[str], Optional[float]]:
+    """Cari kandidat terbaik di window panjang (dan prefilter bigram) untuk threshold"""
+    # Hanya kandidat yang panjangnya masih bisa mencapai threshold
+    lo, hi = _length_window(index, len(normalized_input), threshold, effective_scorer)
+    
+    # Untuk master besar, persempit lagi ke top-K kandidat berdasarkan bigram bersama
+    positions = _bigram_candidates(index, normalized_input, lo, hi)
+    if positions is None:
+        positions = range(lo, hi)
+        candidates = index.choices[lo:hi]
+    else:
+        candidates = [index.choices[position] for position in positions]
     
     if USE_RAPIDFUZZ:
         # FAST PATH: RapidFuzz process.extractOne
         # 10-50x lebih cepat untuk master data besar
+        scorer_func, max_score = FUZZY_SCORERS[scorer]
         result = process.extractOne(
             normalized_input,
-            master_dict.keys(),
-            scorer=fuzz.ratio,
-            score_cutoff=threshold * 100  # RapidFuzz uses 0-100 scale
+            candidates,
+            scorer=scorer_func,
+            score_cutoff=(threshold - SCORE_CUTOFF_EPSILON) * max_score  # skala skor mengikuti scorer
         )
         
         if result:
-            matched_name, score, _ = result
-            return matched_name, score / 100.0  # Convert back to 0-1 scale
+            _, score, candidate = result
+            # Kembalikan key asli master_dict, bukan versi normalisasinya
+            return index.choice_keys[positions[candidate]], score / max_score  # Convert back to 0-1 scale
+        
+        return None, None
+    
+    elif USE_NUMBA:
+        # MIDDLE PATH: kernel numba (skor setara fuzz.ratio), kandidat sudah
+        # disaring window panjang sehingga cukup hitung skor satu per satu
+        query_codes = _encode_codepoints(normalized_input)
+        best_match = None
+        best_score = 0.0
+        
+        for position, master_norm in zip(positions, candidates):
+            score = indel_ratio(query_codes, _encode_codepoints(master_norm))
+            if score > best_score:
+                best_score = score
+                best_match = index.choice_keys[position]
+        
+        if best_score >= threshold - SCORE_CUTOFF_EPSILON:
+            return best_match, best_score
         
         return None, None
     
@@ -178,12 +592,24 @@ def fuzzy_match_material(
         best_match = None
         best_score = 0.0
         
-        for master_name in master_dict.keys():
-            score = calculate_similarity(material_name, master_name)
+        # Satu matcher untuk semua kandidat; query tetap sebagai seq1 seperti calculate_similarity
+        matcher = SequenceMatcher(None, normalized_input)
+        
+        for position, master_norm in zip(positions, candidates):
+            matcher.set_seq2(master_norm)
             
+            # Batas atas murah (O(1) lalu O(n+m)) dulu; kandidat yang tidak bisa
+            # mencapai threshold atau mengalahkan skor terbaik dilewati tanpa ratio() O(n*m)
+            if matcher.real_quick_ratio() < threshold:
+                continue
+            upper_bound = matcher.quick_ratio()
+            if upper_bound < threshold or upper_bound <= best_score:
+                continue
+            
+            score = matcher.ratio()
             if score > best_score:
                 best_score = score
-                best_match = master_name
+                best_match = index.choice_keys[position]
         
         # Return hanya jika score melebihi threshold
         if best_score >= threshold:
@@ -192,6 +618,94 @@ def fuzzy_match_material(
         return None, None
 
 
+# Jumlah baris query per panggilan cdist agar matriks skor tetap kecil
+CDIST_CHUNK_SIZE = 256
+
+
+def fuzzy_match_batch(
+    material_names: List[str],
+    master_dict: Dict[str, Dict],
+    threshold: float = 0.8,
+    workers: int = -1,
+    scorer: str = 'ratio'
+) -> Tuple[List[Optional[str]], List[Optional[float]]]:
+    """
+    Fuzzy matching untuk banyak nama material sekaligus
+    
+    Nama yang identik setelah normalisasi hanya dicocokkan sekali. Query
+    yang merupakan awalan unik dari satu nama master langsung dijawab
+    lewat shortcut prefix. Dengan RapidFuzz, sisa query
+    dibandingkan terhadap seluruh master dalam satu panggilan
+    process.cdist (native code) per chunk, lalu
+    match terbaik dipilih dengan argmax. cdist membagi baris query ke
+    beberapa thread native (GIL dilepas selama scoring). Tanpa RapidFuzz,
+    fallback ke fuzzy_match_material per nama.
+    
+    Args:
+        material_names: List nama material dari vendor
+        master_dict: Dictionary master material
+        threshold: Minimum similarity score (0.0 - 1.0)
+        workers: Jumlah thread untuk cdist (-1 = semua core CPU)
+        scorer: Nama scorer di FUZZY_SCORERS ('ratio' atau 'levenshtein')
+    
+    Returns:
+        Tuple (matched_names, scores) sejajar dengan material_names;
+        elemen bernilai None jika tidak ada match
+    
+    Examples:
+        >>> master = {"KABEL NYY 2x2.5": {...}, "KABEL NYM 3x2.5": {...}}
+        >>> fuzzy_match_batch(["kabel nyy 2x2,5", "xyz"], master, 0.8)
+        (["KABEL NYY 2x2.5", None], [0.96, None])
+    """
+    matched_names: List[Optional[str]] = [None] * len(material_names)
+    scores: List[Optional[float]] = [None] * len(material_names)
+    
+    if not material_names or not master_dict:
+        return matched_names, scores
+    
+    if not USE_RAPIDFUZZ:
+        for i, name in enumerate(material_names):
+            matched_names[i], scores[i] = fuzzy_match_material(name, master_dict, threshold, scorer)
+        return matched_names, scores
+    
+    index = get_master_index(master_dict)
+    choices = index.choices
+    
+    # Nama yang sama setelah normalisasi cukup dicocokkan sekali
+    query_rows: Dict[str, List[int]] = {}
+    for i, name in enumerate(material_names):
+        query_rows.setdefault(normalize_text(name) if isinstance(name, str) else '', []).append(i)
+    
+    # Semua query ikut cdist: match prefix unik belum tentu yang terbaik, dan
+    # cdist hanya menerima satu score_cutoff untuk seluruh chunk
+    queries = list(query_rows)
+    
+    scorer_func, max_score = FUZZY_SCORERS[scorer]
+    score_cutoff = (threshold - SCORE_CUTOFF_EPSILON) * max_score
+    
+    for start in range(0, len(queries), CDIST_CHUNK_SIZE):
+        chunk = queries[start:start + CDIST_CHUNK_SIZE]
+        
+        # Matriks skor (len(chunk) x len(choices)), skor < cutoff menjadi 0
+        score_matrix = process.cdist(
+            chunk,
+            choices,
+            scorer=scorer_func,
+            score_cutoff=score_cutoff,
+            dtype=np.float32,
+            workers=workers
+        )
+        best_idx = score_matrix.argmax(axis=1)
+        best_score = score_matrix[np.arange(len(chunk)), best_idx]
+        
+        for offset in np.flatnonzero(best_score >= np.float32(score_cutoff)):
+            for i in query_rows[chunk[offset]]:
+                matched_names[i] = index.choice_keys[best_idx[offset]]
+                scores[i] = float(best_score[offset]) / max_score
+    
+    return matched_names, scores
+
+
 # ==================== HELPER FUNCTIONS ====================
 
 def huruf_ke_angka(huruf: str) -> int:
@@ -230,19 +744,20 @@ def load_master_from_dataframe(df_master: pd.DataFrame) -> Dict[str, Dict[str, s
         Dictionary dengan struktur: {nama_material: {Kode: xxx, Tipe: xxx}}
     """
     try:
-        master_dict = {}
+        # Ekstraksi per kolom (vectorized), bukan per baris
+        nama = df_master['Nama'].astype(str).str.strip()
+        kode = df_master['Kode'].astype(str).str.strip().where(df_master['Kode'].notna(), '-')
+        tipe = df_master['Tipe'].astype(str).str.strip().where(df_master['Tipe'].notna(), '-')
         
-        for _, row in df_master.iterrows():
-            nama_key = str(row['Nama']).strip()
-            
-            # Skip jika nama kosong atau NaN
-            if not nama_key or nama_key.lower() == 'nan':
-                continue
-            
-            master_dict[nama_key] = {
-                'Kode': str(row['Kode']).strip() if pd.notna(row['Kode']) else '-',
-                'Tipe': str(row['Tipe']).strip() if pd.notna(row['Tipe']) else '-'
-            }
+        # Skip jika nama kosong atau NaN
+        valid = ((nama != '') & (nama.str.lower() != 'nan')).to_numpy()
+        
+        master_dict = {
+            sys.intern(nama_key): {'Kode': kode_value, 'Tipe': tipe_value}
+            for nama_key, kode_value, tipe_value in zip(
+                nama.to_numpy()[valid], kode.to_numpy()[valid], tipe.to_numpy()[valid]
+            )
+        }
         
         logger.info(f"Berhasil memuat {len(master_dict)} material dari master data")
         return master_dict
@@ -265,6 +780,10 @@ def validate_config(config: Dict[str, Any], df_shape: tuple) -> Tuple[bool, str]
     """
     max_col_index = df_shape[1] - 1
     
+    scorer = config.get('fuzzy_scorer', 'ratio')
+    if USE_RAPIDFUZZ and scorer not in FUZZY_SCORERS:
+        return False, f"Fuzzy scorer '{scorer}' tidak dikenal (pilihan: {', '.join(FUZZY_SCORERS)})"
+    
     for key, value in config.items():
         # Skip non-integer config values
         if not isinstance(value, int):
@@ -289,12 +808,22 @@ def safe_numeric(value: Any, default: float = 0.0) -> float:
     
     Returns:
         Nilai numerik atau default
+    
+    Note:
+        Untuk nilai skalar; kolom/Series dikonversi langsung dengan
+        pd.to_numeric(..., errors='coerce') seperti di proses_data_vendor.
     """
     try:
+        result = float(value)
+    except (TypeError, ValueError):
+        return default
+    except OverflowError:
+        # int di luar jangkauan float: jalur lama pd.to_numeric mengembalikannya utuh
         result = pd.to_numeric(value, errors='coerce')
         return result if pd.notna(result) else default
-    except:
-        return default
+    
+    # NaN tidak sama dengan dirinya sendiri
+    return result if result == result else default
 
 
 # ==================== MAIN PROCESSING ENGINE ====================
@@ -317,7 +846,8 @@ def proses_data_vendor(
     Args:
         df_v: DataFrame vendor (raw)
         master_dict: Dictionary master material
-        config: Konfigurasi index kolom (termasuk fuzzy_threshold)
+        config: Konfigurasi index kolom; opsional 'fuzzy_scorer' (nama di
+            FUZZY_SCORERS, default 'ratio')
     
     Returns:
         DataFrame hasil konversi dalam format SOSYS
@@ -330,33 +860,37 @@ def proses_data_vendor(
             logger.error(f"Konfigurasi tidak valid: {error_msg}")
             return pd.DataFrame()
         
-        # Ekstrak konfigurasi
-        c_u = config['c_uraian']
-        c_m = config['c_mat']
-        c_p = config['c_psg']
-        c_b = config['c_bkr']
-        c_s = config['c_satuan']
-        c_t = config['c_total']
         fuzzy_threshold = 0.8  # Fixed at 80%
+        fuzzy_scorer = config.get('fuzzy_scorer', 'ratio')
         
-        # Buat working dataframe dengan kolom yang relevan saja (memory efficient)
-        df_work = pd.DataFrame({
-            'nama': df_v.iloc[:, c_u].astype(str).str.strip(),
-            'vol_mat': pd.to_numeric(df_v.iloc[:, c_m], errors='coerce').fillna(0),
-            'vol_psg': pd.to_numeric(df_v.iloc[:, c_p], errors='coerce').fillna(0),
-            'vol_bkr': pd.to_numeric(df_v.iloc[:, c_b], errors='coerce').fillna(0),
-            'satuan': df_v.iloc[:, c_s].astype(str).str.strip().str.upper(),
-            'total': pd.to_numeric(df_v.iloc[:, c_t], errors='coerce').fillna(0)
-        })
+        # Buat working dataframe dengan kolom yang relevan saja (memory efficient),
+        # diambil sekaligus dengan satu seleksi posisi
+        df_work = df_v.iloc[:, [
+            config['c_uraian'],
+            config['c_mat'],
+            config['c_psg'],
+            config['c_bkr'],
+            config['c_satuan'],
+            config['c_total']
+        ]].set_axis(['nama', 'vol_mat', 'vol_psg', 'vol_bkr', 'satuan', 'total'], axis=1)
+        
+        df_work['nama'] = df_work['nama'].astype(str).str.strip()
+        df_work['satuan'] = df_work['satuan'].astype(str).str.strip().str.upper()
+        for col in ('vol_mat', 'vol_psg', 'vol_bkr', 'total'):
+            df_work[col] = pd.to_numeric(df_work[col], errors='coerce').fillna(0)
         
         # Pre-filtering (vectorized) - jauh lebih cepat dari loop
+        # Lowercase sekali, dipakai untuk filter dan normalisasi di bawah
+        nama_lower = df_work['nama'].str.lower()
         mask_valid = (
             (df_work['total'] > 0) &  # Harga harus > 0
-            (df_work['nama'].str.lower() != 'nan') &  # Bukan NaN
-            (~df_work['nama'].str.contains('TOTAL', case=False, na=False))  # Tidak mengandung "TOTAL"
+            (nama_lower != 'nan') &  # Bukan NaN
+            (~nama_lower.str.contains('total', regex=False, na=False))  # Tidak mengandung "TOTAL"
         )
         
-        df_filtered = df_work[mask_valid].copy()
+        # Boolean indexing sudah menghasilkan frame baru; kolom hasil ditambahkan sekali lewat assign()
+        df_filtered = df_work[mask_valid]
+        nama_lower = nama_lower[mask_valid]
         
         logger.info(f"Data terfilter: {len(df_filtered)} dari {len(df_v)} baris")
         
@@ -366,79 +900,100 @@ def proses_data_vendor(
         
         # ==================== FUZZY MATCHING LOOKUP ====================
         
-        def lookup_with_fuzzy(nama):
-            """
-            Lookup material dengan prioritas:
-            1. Exact match (langsung dari dict)
-            2. Fuzzy match (jika exact tidak ketemu)
-            """
-            # Try exact match first
-            if nama in master_dict:
-                return pd.Series([
-                    master_dict[nama]['Kode'],
-                    master_dict[nama]['Tipe'],
-                    None,  # match_score (None = exact match)
-                    None   # matched_with (None = exact match)
-                ])
-            
-            # Try fuzzy match
-            matched_name, score = fuzzy_match_material(nama, master_dict, fuzzy_threshold)
+        # Lookup material dengan prioritas:
+        # 1. Exact match (langsung dari dict)
+        # 2. Exact match setelah normalisasi (beda huruf besar/spasi saja)
+        # 3. Fuzzy match (jika exact tidak ketemu), sekali batch untuk semua nama sisa
+        master_index = get_master_index(master_dict)
+        # Intern nama vendor: nama yang berulang jadi satu objek, sehingga lookup
+        # dict/LRU cache cukup membandingkan pointer
+        nama_values = np.array([sys.intern(nama) for nama in df_filtered['nama']], dtype=object)
+        
+        # Posisi di master_index.kodes/tipes, -1 = belum ketemu
+        positions = np.fromiter(
+            (master_index.key_to_idx.get(nama, -1) for nama in nama_values),
+            dtype=np.int64,
+            count=len(nama_values)
+        )
+        match_score = np.full(len(nama_values), np.nan)  # NaN = exact match / tidak ketemu
+        matched_with = np.full(len(nama_values), None, dtype=object)
+        
+        # Normalisasi vectorized (setara normalize_text) hanya untuk baris sisa
+        residual_rows = np.flatnonzero(positions < 0)
+        if len(residual_rows):
+            # nama sudah di-strip, jadi cukup lowercase + rapatkan spasi
+            nama_norm = nama_lower.iloc[residual_rows].str.replace(_WS_RE, ' ', regex=True)
+            positions[residual_rows] = nama_norm.map(master_index.norm_to_idx).fillna(-1).to_numpy(dtype=np.int64)
+        
+        fuzzy_rows = np.flatnonzero(positions < 0)
+        if len(fuzzy_rows):
+            # Nama yang sama cukup dicocokkan sekali
+            inverse, unique_names = pd.factorize(nama_values[fuzzy_rows])
+            matched_names, scores = fuzzy_match_batch(
+                list(unique_names), master_dict, fuzzy_threshold, scorer=fuzzy_scorer
+            )
             
-            if matched_name:
-                return pd.Series([
-                    master_dict[matched_name]['Kode'],
-                    master_dict[matched_name]['Tipe'],
-                    score * 100,  # Convert to percentage
-                    matched_name
-                ])
+            unique_positions = np.array(
+                [master_index.key_to_idx[name] if name else -1 for name in matched_names],
+                dtype=np.int64
+            )
+            unique_scores = np.array(
+                [score * 100 if name else np.nan for name, score in zip(matched_names, scores)]  # Convert to percentage
+            )
             
-            # No match found
-            return pd.Series(['-', '-', None, None])
+            positions[fuzzy_rows] = unique_positions[inverse]
+            match_score[fuzzy_rows] = unique_scores[inverse]
+            matched_with[fuzzy_rows] = np.array(matched_names, dtype=object)[inverse]
         
-        # Apply lookup dengan fuzzy matching
-        df_filtered[['Kode Material', 'Tipe Material', 'Match Score', 'Matched With']] = \
-            df_filtered['nama'].apply(lookup_with_fuzzy)
+        found = positions >= 0
+        kode_material = np.full(len(nama_values), '-', dtype=object)
+        tipe_material = np.full(len(nama_values), '-', dtype=object)
+        kode_material[found] = master_index.kodes[positions[found]]
+        tipe_material[found] = master_index.tipes[positions[found]]
         
         # ==================== PLN vs TUNAI LOGIC ====================
         
-        df_filtered['Jumlah Material Gudang (PLN)'] = np.where(
-            df_filtered['satuan'] == 'PLN',
-            df_filtered['vol_mat'],
-            0
-        )
+        # Satu scan untuk mask, lalu perkalian dengan bool (branchless)
+        is_pln = (df_filtered['satuan'] == 'PLN').to_numpy()
+        vol_mat = df_filtered['vol_mat'].to_numpy()
+        jumlah_pln = vol_mat * is_pln
+        jumlah_tunai = vol_mat * ~is_pln
         
-        df_filtered['Jumlah Material Dipesan (Tunai)'] = np.where(
-            df_filtered['satuan'] != 'PLN',
-            df_filtered['vol_mat'],
-            0
-        )
+        # Semua kolom baru ditambahkan sekaligus (satu frame baru, tanpa SettingWithCopyWarning)
+        df_filtered = df_filtered.assign(**{
+            'Kode Material': kode_material,
+            'Tipe Material': tipe_material,
+            'Match Score': match_score,
+            'Matched With': matched_with,
+            'Jumlah Material Gudang (PLN)': jumlah_pln,
+            'Jumlah Material Dipesan (Tunai)': jumlah_tunai
+        })
         
         # ==================== SUSUN HASIL FINAL ====================
         
-        # Kolom output sesuai template SOSYS (tanpa kolom fuzzy matching info)
-        result_columns = {
-            'Kode Material': df_filtered['Kode Material'],
-            'Nama Material': df_filtered['nama'],
-            'Tipe Material': df_filtered['Tipe Material'],
-            'Referensi Jumlah': 1,
-            'Jumlah Material Gudang (PLN)': df_filtered['Jumlah Material Gudang (PLN)'],
-            'Jumlah Material Dipesan (Tunai)': df_filtered['Jumlah Material Dipesan (Tunai)'],
-            'Jumlah Pasang': df_filtered['vol_psg'],
-            'Jumlah Bongkar': df_filtered['vol_bkr']
-        }
-        
-        df_hasil = pd.DataFrame(result_columns)
-        
-        # Reset index
-        df_hasil = df_hasil.reset_index(drop=True)
+        # Kolom output sesuai template SOSYS (tanpa kolom fuzzy matching info):
+        # pilih kolom yang sudah ada, ganti nama sekali, lalu tambah konstanta
+        df_hasil = (
+            df_filtered[[
+                'Kode Material', 'nama', 'Tipe Material',
+                'Jumlah Material Gudang (PLN)', 'Jumlah Material Dipesan (Tunai)',
+                'vol_psg', 'vol_bkr'
+            ]]
+            .rename(columns={
+                'nama': 'Nama Material',
+                'vol_psg': 'Jumlah Pasang',
+                'vol_bkr': 'Jumlah Bongkar'
+            })
+            .reset_index(drop=True)
+        )
+        df_hasil.insert(3, 'Referensi Jumlah', 1)
         
         # ==================== LOG STATISTIK ====================
         
+        # Dihitung sekali dari array lookup, tanpa scan ulang kolom DataFrame
         total_items = len(df_hasil)
-        exact_matched = (df_hasil['Kode Material'] != '-').sum()
-        
-        # Hitung fuzzy match dari kolom internal df_filtered
-        fuzzy_matched = df_filtered['Match Score'].notna().sum()
+        exact_matched = np.count_nonzero(found)
+        fuzzy_matched = np.count_nonzero(~np.isnan(match_score))
         exact_only = exact_matched - fuzzy_matched
         unmatched = total_items - exact_matched
         
@@ -456,9 +1011,71 @@ def proses_data_vendor(
         return pd.DataFrame()
 
 
+# ==================== PARALLEL PROCESSING ====================
+
+# master_dict milik proses worker, di-set sekali oleh initializer ProcessPoolExecutor
+_WORKER_MASTER_DICT: Optional[Dict[str, Dict]] = None
+
+
+def _set_worker_master(master_dict: Dict[str, Dict]):
+    """Initializer worker: simpan master_dict sebagai global proses"""
+    global _WORKER_MASTER_DICT
+    _WORKER_MASTER_DICT = master_dict
+
+
+def _process_job(job: Tuple[pd.DataFrame, Dict[str, Any]]) -> pd.DataFrame:
+    """Proses satu (df_vendor, config) di worker memakai master_dict global"""
+    df_vendor, config = job
+    return proses_data_vendor(df_vendor, _WORKER_MASTER_DICT, config)
+
+
+def process_many(
+    files_and_configs: Iterable[Tuple[pd.DataFrame, Dict[str, Any]]],
+    master_dict: Dict[str, Dict],
+    workers: Optional[int] = None
+) -> Iterator[pd.DataFrame]:
+    """
+    Proses banyak file vendor secara paralel (satu file per task)
+    
+    proses_data_vendor CPU-bound dan tidak mengubah state bersama, sehingga
+    beberapa file bisa diproses di proses terpisah tanpa terhalang GIL.
+    master_dict hanya di-pickle sekali per worker lewat initializer, bukan
+    per task; konsekuensinya tiap worker memegang satu salinan master
+    (plus MasterIndex-nya) di memori.
+    
+    Args:
+        files_and_configs: Iterable berisi tuple (df_vendor, config)
+        master_dict: Dictionary master material
+        workers: Jumlah proses worker (None = jumlah CPU)
+    
+    Yields:
+        DataFrame hasil konversi, urutan sama dengan input
+    """
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_set_worker_master,
+        initargs=(master_dict,)
+    ) as executor:
+        yield from executor.map(_process_job, files_and_configs)
+
+
 # ==================== SUMMARY REPORT ====================
 
-def generate_summary(df_hasil: pd.DataFrame) -> Dict[str, Any]:
+class Summary(NamedTuple):
+    """Statistik summary hasil konversi (lihat generate_summary)"""
+    total_items: int = 0
+    matched: int = 0
+    exact_matched: int = 0
+    fuzzy_matched: int = 0
+    unmatched: int = 0
+    pln_items: int = 0
+    tunai_items: int = 0
+    total_vol_mat: float = 0
+    total_pasang: float = 0
+    total_bongkar: float = 0
+
+
+def generate_summary(df_hasil: pd.DataFrame) -> Summary:
     """
     Generate statistik summary dari hasil konversi
     
@@ -466,32 +1083,25 @@ def generate_summary(df_hasil: pd.DataFrame) -> Dict[str, Any]:
         df_hasil: DataFrame hasil konversi
     
     Returns:
-        Dictionary berisi statistik
+        Summary berisi statistik (akses per atribut, mis. summary.matched)
     """
     if df_hasil.empty:
-        return {
-            'total_items': 0,
-            'matched': 0,
-            'unmatched': 0,
-            'fuzzy_matched': 0,
-            'exact_matched': 0,
-            'pln_items': 0,
-            'tunai_items': 0
-        }
+        return Summary()
     
-    matched = (df_hasil['Kode Material'] != '-').sum()
+    # Satu perbandingan untuk matched dan unmatched sekaligus
+    matched = np.count_nonzero(df_hasil['Kode Material'].to_numpy() != '-')
     fuzzy_matched = df_hasil['Match Score'].notna().sum() if 'Match Score' in df_hasil.columns else 0
     
-    return {
-        'total_items': len(df_hasil),
-        'matched': matched,
-        'exact_matched': matched - fuzzy_matched,
-        'fuzzy_matched': fuzzy_matched,
-        'unmatched': (df_hasil['Kode Material'] == '-').sum(),
-        'pln_items': (df_hasil['Jumlah Material Gudang (PLN)'] > 0).sum(),
-        'tunai_items': (df_hasil['Jumlah Material Dipesan (Tunai)'] > 0).sum(),
-        'total_vol_mat': df_hasil['Jumlah Material Gudang (PLN)'].sum() + 
-                        df_hasil['Jumlah Material Dipesan (Tunai)'].sum(),
-        'total_pasang': df_hasil['Jumlah Pasang'].sum(),
-        'total_bongkar': df_hasil['Jumlah Bongkar'].sum()
-    }
+    return Summary(
+        total_items=len(df_hasil),
+        matched=matched,
+        exact_matched=matched - fuzzy_matched,
+        fuzzy_matched=fuzzy_matched,
+        unmatched=len(df_hasil) - matched,
+        pln_items=(df_hasil['Jumlah Material Gudang (PLN)'] > 0).sum(),
+        tunai_items=(df_hasil['Jumlah Material Dipesan (Tunai)'] > 0).sum(),
+        total_vol_mat=df_hasil['Jumlah Material Gudang (PLN)'].sum() + 
+                      df_hasil['Jumlah Material Dipesan (Tunai)'].sum(),
+        total_pasang=df_hasil['Jumlah Pasang'].sum(),
+        total_bongkar=df_hasil['Jumlah Bongkar'].sum()
+    )
@@ -3,11 +3,8 @@ CSS Styles for SOSYS Material Automation
 All styling and visual design elements
 """
 
-def get_custom_css():
-    """
-    Returns the complete CSS styling for the application
-    """
-    return """
+# Built once at import; get_custom_css() returns the same string on every rerun
+_CSS_HTML = """
     <link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.4.0/css/all.min.css">
     <style>
         /* ==================== GLOBAL STYLES ==================== */
@@ -194,6 +191,15 @@ def get_custom_css():
         }
         
         /* ==================== METRICS ==================== */
+        .flex-row {
+            display: flex;
+            gap: 1rem;
+        }
+        
+        .flex-row > * {
+            flex: 1;
+        }
+        
         .metric-card {
             background: var(--surface);
             border-radius: 12px;
@@ -367,10 +373,26 @@ def get_custom_css():
             color: var(--primary);
         }
         
+        .info-box {
+            background-color: #eff6ff;
+            color: var(--primary-dark);
+            padding: 0.75rem 1rem;
+            border-radius: 0.375rem;
+            border-left: 4px solid var(--primary);
+            margin-bottom: 1rem;
+        }
+        
         hr {
             border: none;
             border-top: 1px solid var(--border);
             margin: 2rem 0;
         }
     </style>
-    """
\ No newline at end of file
+    """
+
+
+def get_custom_css():
+    """
+    Returns the complete CSS styling for the application
+    """
+    return _CSS_HTML
@@ -5,13 +5,66 @@ Contains all UI rendering functions
 
 import streamlit as st
 import pandas as pd
+import numpy as np
 import io
+import textwrap
+import xlsxwriter
 from datetime import datetime
-from typing import Dict, Any
+from functools import lru_cache, partial
+from typing import Dict, Any, Optional, Tuple
 
+# PyArrow's C++ CSV writer is optional; pandas.to_csv is the fallback
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+    USE_PYARROW_CSV = True
+except ImportError:
+    USE_PYARROW_CSV = False
 
-def render_header():
-    """Render navbar and main title"""
+
+def join_html_blocks(*blocks: str) -> str:
+    """
+    Combine several HTML/markdown snippets into one st.markdown body
+    
+    Each snippet is dedented and separated by a blank line, so every one
+    starts its own markdown block at column 0 (an indented line after a
+    blank line would otherwise render as a code block).
+    
+    Args:
+        *blocks: HTML or markdown snippets
+    
+    Returns:
+        Combined markdown text
+    """
+    return "\n\n".join(textwrap.dedent(block).strip() for block in blocks)
+
+
+# Static title block under the navbar (identical on every rerun)
+TITLE_HTML = """
+    <div class="header-wrapper">
+        <div class="main-title">
+            SOSYS Automated Material Entry
+        </div>
+        <div class="subtitle">
+            Otomasi Konversi Material RAB Vendor ke Template PK SOSYS
+        </div>
+    </div>
+    """
+
+# Divider, heading and hint above the download buttons
+DOWNLOAD_HEADER_HTML = join_html_blocks(
+    "<hr>",
+    "### <i class='fas fa-download icon'></i>Unduh Hasil",
+    "<div class='info-box'>Unduh data yang telah diproses dalam format Excel atau CSV</div>"
+)
+
+# FontAwesome icon per step number; index 0 is the fallback for unknown steps
+STEP_ICONS = ('check', 'database', 'file-excel', 'sliders-h', 'cogs')
+
+
+@lru_cache(maxsize=1)
+def _navbar_html() -> str:
+    """Build the navbar HTML once; the logo is read from disk on the first call only"""
     import base64
     import os
 
@@ -33,7 +86,7 @@ def render_header():
         else '<div class="navbar-logo-placeholder"><i class="fas fa-bolt"></i></div>'
     )
 
-    st.markdown(f"""
+    return f"""
     <div class="navbar">
         <div class="navbar-brand">
             {logo_img_html}
@@ -44,19 +97,37 @@ def render_header():
         </div>
         
     </div>
-    """, unsafe_allow_html=True)
+    """
 
-    st.markdown(f"""
-    <div class="header-wrapper">
-        <div class="main-title">
-            SOSYS Automated Material Entry
+
+@lru_cache(maxsize=1)
+def _header_html() -> str:
+    """Navbar, title and divider as one markdown document"""
+    return join_html_blocks(_navbar_html(), TITLE_HTML, "<hr>")
+
+
+def render_header():
+    """Render navbar and main title"""
+    st.markdown(_header_html(), unsafe_allow_html=True)
+
+
+@lru_cache(maxsize=32)
+def _step_card_html(step_number: int, title: str, description: str) -> str:
+    """Build (and memoize) the HTML for one step card"""
+    icon = STEP_ICONS[step_number] if 0 < step_number < len(STEP_ICONS) else STEP_ICONS[0]
+    
+    return f"""
+    <div class="step-card">
+        <div class="step-title">
+            <span class="step-number">{step_number}</span>
+            <i class="fas fa-{icon} icon"></i>
+            {title}
         </div>
-        <div class="subtitle">
-            Otomasi Konversi Material RAB Vendor ke Template PK SOSYS
+        <div class="step-description">
+            {description}
         </div>
     </div>
-    """, unsafe_allow_html=True)
-    st.markdown("<hr>", unsafe_allow_html=True)
+    """
 
 
 def render_step_card(step_number: int, title: str, description: str):
@@ -68,27 +139,21 @@ def render_step_card(step_number: int, title: str, description: str):
         title: Step title
         description: Step description
     """
-    # Get icon based on step number
-    icons = {
-        1: 'database',
-        2: 'file-excel',
-        3: 'sliders-h',
-        4: 'cogs'
-    }
-    icon = icons.get(step_number, 'check')
-    
-    st.markdown(f"""
-    <div class="step-card">
-        <div class="step-title">
-            <span class="step-number">{step_number}</span>
-            <i class="fas fa-{icon} icon"></i>
-            {title}
-        </div>
-        <div class="step-description">
-            {description}
+    st.markdown(_step_card_html(step_number, title, description), unsafe_allow_html=True)
+
+
+@lru_cache(maxsize=256)
+def _metric_card_html(icon: str, value: int, label: str, color: str) -> str:
+    """Build (and memoize) the HTML for one metric card"""
+    return f"""
+    <div class="metric-card">
+        <div class="metric-icon" style="color: var(--{color});">
+            <i class="fas fa-{icon}"></i>
         </div>
+        <div class="metric-value">{value:,}</div>
+        <div class="metric-label">{label}</div>
     </div>
-    """, unsafe_allow_html=True)
+    """
 
 
 def render_metric_card(icon: str, value: int, label: str, color: str = 'primary'):
@@ -101,15 +166,71 @@ def render_metric_card(icon: str, value: int, label: str, color: str = 'primary'
         label: Label text
         color: Color theme (primary, success, danger, warning)
     """
-    st.markdown(f"""
-    <div class="metric-card">
-        <div class="metric-icon" style="color: var(--{color});">
-            <i class="fas fa-{icon}"></i>
-        </div>
-        <div class="metric-value">{value:,}</div>
-        <div class="metric-label">{label}</div>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(_metric_card_html(icon, int(value), label, color), unsafe_allow_html=True)
+
+
+def _metrics_row_html(items: Tuple[Tuple[str, int, str, str], ...]) -> str:
+    """Join metric cards into one equal-width flex row (.flex-row in styles.py)"""
+    # Dedent each card: a blank line followed by an indented <div> would be
+    # parsed by markdown as an indented code block
+    cards = "".join(
+        textwrap.dedent(_metric_card_html(icon, int(value), label, color)).strip()
+        for icon, value, label, color in items
+    )
+    return f"<div class='flex-row'>{cards}</div>"
+
+
+def render_metrics_row(items: Tuple[Tuple[str, int, str, str], ...]):
+    """
+    Render several metric cards side by side with a single st.markdown call
+    
+    Args:
+        items: (icon, value, label, color) per card, see render_metric_card
+    """
+    st.markdown(_metrics_row_html(items), unsafe_allow_html=True)
+
+
+# Same markdown heading for the empty and the filled statistics block
+STATS_HEADING = "### Ringkasan Hasil"
+
+# Statistics block for an empty result: heading plus four zero cards in one markdown call
+_EMPTY_STATS_HTML = join_html_blocks(
+    STATS_HEADING,
+    _metrics_row_html((
+        ('box', 0, 'Total Material', 'primary'),
+        ('check-circle', 0, 'Cocok', 'success'),
+        ('times-circle', 0, 'Tidak Cocok', 'danger'),
+        ('building', 0, 'Material PLN', 'warning'),
+    )),
+    "<br>"
+)
+
+
+def unmatched_material_mask(kode: pd.Series) -> np.ndarray:
+    """
+    Mask of rows without a master match
+    
+    A row is unmatched when its Kode Material is '-' or empty (None/NaN,
+    e.g. a row newly added in the data editor).
+    
+    Args:
+        kode: Kode Material column
+    
+    Returns:
+        Boolean array aligned with kode
+    """
+    if isinstance(kode.dtype, pd.CategoricalDtype):
+        # Compare small integer codes instead of Python strings; -1 is missing
+        codes = kode.cat.codes.to_numpy()
+        missing = codes == -1
+        try:
+            sentinel_code = kode.cat.categories.get_loc('-')
+        except KeyError:
+            return missing
+        return missing | (codes == sentinel_code)
+    
+    values = kode.to_numpy()
+    return pd.isna(values) | (values == '-')
 
 
 def render_statistics(df_stats: pd.DataFrame):
@@ -119,95 +240,211 @@ def render_statistics(df_stats: pd.DataFrame):
     Args:
         df_stats: DataFrame containing processed results
     """
-    matched = (df_stats['Kode Material'] != '-').sum()
-    unmatched = (df_stats['Kode Material'] == '-').sum()
-    pln_count = (df_stats['Jumlah Material Gudang (PLN)'] > 0).sum()
+    if df_stats is None or df_stats.empty:
+        st.markdown(_EMPTY_STATS_HTML, unsafe_allow_html=True)
+        return
     
-    st.markdown("### Ringkasan Hasil", unsafe_allow_html=True)
+    # One mask per column; matched is the complement of unmatched.
+    # The PLN column can hold None after display prep/editing, so read it as float
+    unmatched = int(np.count_nonzero(unmatched_material_mask(df_stats['Kode Material'])))
+    matched = len(df_stats) - unmatched
+    pln = df_stats['Jumlah Material Gudang (PLN)'].to_numpy(dtype=float, na_value=np.nan)
+    pln_count = int(np.count_nonzero(pln > 0))
+    
+    st.markdown(STATS_HEADING, unsafe_allow_html=True)
+    
+    render_metrics_row((
+        ('box', len(df_stats), 'Total Material', 'primary'),
+        ('check-circle', matched, 'Cocok', 'success'),
+        ('times-circle', unmatched, 'Tidak Cocok', 'danger'),
+        ('building', pln_count, 'Material PLN', 'warning'),
+    ))
+    
+    st.markdown("<br>", unsafe_allow_html=True)
+
+
+# Above this many cells the Excel export switches to xlsxwriter's constant_memory mode
+XLSX_CONSTANT_MEMORY_CELLS = 50_000
+
+
+def dataframe_to_xlsx(df: pd.DataFrame, sheet_name: str) -> bytes:
+    """
+    Serialize a DataFrame to XLSX bytes with xlsxwriter directly
     
-    col1, col2, col3, col4 = st.columns(4)
+    Writes one row per write_row call instead of going through
+    DataFrame.to_excel, which formats and styles every cell individually.
+    The header keeps the same look as pandas (bold, bordered, centered).
     
-    with col1:
-        render_metric_card('box', len(df_stats), 'Total Material', 'primary')
+    Args:
+        df: DataFrame to export (index is not written)
+        sheet_name: Worksheet name (max 31 characters)
     
-    with col2:
-        render_metric_card('check-circle', matched, 'Cocok', 'success')
+    Returns:
+        XLSX file content
+    """
+    towrite = io.BytesIO()
+    # Large exports flush each row to a temp file (inline strings, no shared
+    # strings table); small ones stay fully in memory, which is faster
+    if df.size > XLSX_CONSTANT_MEMORY_CELLS:
+        workbook_options = {'constant_memory': True}
+    else:
+        workbook_options = {'in_memory': True}
+    workbook = xlsxwriter.Workbook(towrite, workbook_options)
+    worksheet = workbook.add_worksheet(sheet_name)
+    header_format = workbook.add_format({'bold': True, 'border': 1, 'align': 'center', 'valign': 'top'})
     
-    with col3:
-        render_metric_card('times-circle', unmatched, 'Tidak Cocok', 'danger')
+    worksheet.write_row(0, 0, [str(col) for col in df.columns], header_format)
     
-    with col4:
-        render_metric_card('building', pln_count, 'Material PLN', 'warning')
+    # NaN/NA become None so xlsxwriter leaves the cell empty (as to_excel does)
+    values = df.astype(object).where(df.notna(), None)
+    for row_idx, row in enumerate(values.itertuples(index=False, name=None), start=1):
+        worksheet.write_row(row_idx, 0, row)
+    # Release the object copy before close() builds the zip, to lower peak memory
+    del values
     
-    st.markdown("<br>", unsafe_allow_html=True)
+    # st.download_button only accepts bytes (not a memoryview of the buffer),
+    # so getvalue() is the single copy out of the BytesIO
+    workbook.close()
+    return towrite.getvalue()
 
 
-def create_download_section(edited_df: pd.DataFrame, display_name: str):
+def dataframe_to_csv(df: pd.DataFrame) -> bytes:
+    """
+    Serialize a DataFrame to UTF-8 CSV bytes (index is not written)
+    
+    Uses pyarrow.csv.write_csv when available. Object columns that Arrow
+    cannot type (e.g. text typed into a numeric column in the editor)
+    fall back to DataFrame.to_csv.
+    
+    Args:
+        df: DataFrame to export
+    
+    Returns:
+        CSV file content
+    """
+    if USE_PYARROW_CSV:
+        try:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            pass
+        else:
+            buf = pa.BufferOutputStream()
+            pacsv.write_csv(table, buf, write_options=pacsv.WriteOptions(include_header=True))
+            return buf.getvalue().to_pybytes()
+    
+    return df.to_csv(index=False).encode('utf-8')
+
+
+def dataframe_hash(df: pd.DataFrame) -> int:
+    """
+    Content hash of a DataFrame (values, row order and column names)
+    
+    Args:
+        df: DataFrame to hash
+    
+    Returns:
+        Integer hash, equal for DataFrames with identical content
+    """
+    row_hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    return hash((row_hashes.tobytes(), tuple(df.columns)))
+
+
+# The leading underscore keeps Streamlit from hashing the DataFrame itself;
+# df_hash is the cache key, computed once per render by the caller
+@st.cache_data(show_spinner=False, max_entries=8)
+def _cached_xlsx(df_hash: int, _df: pd.DataFrame, sheet_name: str) -> bytes:
+    """XLSX bytes for a DataFrame, cached on its content hash"""
+    return dataframe_to_xlsx(_df, sheet_name)
+
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def _cached_csv(df_hash: int, _df: pd.DataFrame) -> bytes:
+    """CSV bytes for a DataFrame, cached on its content hash"""
+    return dataframe_to_csv(_df)
+
+
+def create_download_section(edited_df: pd.DataFrame, display_name: str, df_hash: Optional[int] = None):
     """
     Create download section with Excel and CSV buttons
     
     Args:
         edited_df: DataFrame to download
         display_name: Name to use in filename
+        df_hash: dataframe_hash(edited_df) if the caller already has it
+            (e.g. memoized across reruns); computed here when omitted
     """
-    st.markdown("<hr>", unsafe_allow_html=True)
-    st.markdown("### <i class='fas fa-download icon'></i>Unduh Hasil", unsafe_allow_html=True)
-    st.info("Unduh data yang telah diproses dalam format Excel atau CSV")
+    st.markdown(DOWNLOAD_HEADER_HTML, unsafe_allow_html=True)
+    
+    # Content hash is the cache key; unchanged data reuses the cached bytes
+    if df_hash is None:
+        df_hash = dataframe_hash(edited_df)
+    # One timestamp so the Excel and CSV filenames always match
+    file_stem = f"SOSYS_{display_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
     
-    col_dl1, col_dl2 = st.columns([1, 1])
+    # Files are only built when a button is clicked (st.download_button calls
+    # the callable then); reruns without a download cost nothing here
+    xlsx_data = partial(_cached_xlsx, df_hash, edited_df, display_name[:31])
+    csv_data = partial(_cached_csv, df_hash, edited_df)
     
-    with col_dl1:
+    # One horizontal flex container instead of two st.columns containers
+    with st.container(horizontal=True):
         # Export Excel
-        towrite = io.BytesIO()
-        with pd.ExcelWriter(towrite, engine='xlsxwriter') as writer:
-            edited_df.to_excel(writer, index=False, sheet_name=display_name[:31])
-        
         st.download_button(
             "Download Excel",
-            towrite.getvalue(),
-            f"SOSYS_{display_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
+            xlsx_data,
+            f"{file_stem}.xlsx",
             mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
             width='stretch'
         )
-    
-    with col_dl2:
+        
         # Export CSV
-        csv_data = edited_df.to_csv(index=False)
         st.download_button(
             "Download CSV",
             csv_data,
-            f"SOSYS_{display_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
+            f"{file_stem}.csv",
             mime="text/csv",
             width='stretch'
         )
 
 
-def prepare_dataframe_for_display(df: pd.DataFrame, numeric_columns: list) -> pd.DataFrame:
+def prepare_dataframe_for_display(df: pd.DataFrame, numeric_columns: list, *, copy: bool = True) -> pd.DataFrame:
     """
     Prepare DataFrame for display by formatting numeric columns
     
     Args:
         df: DataFrame to prepare
         numeric_columns: List of column names to format as numeric
+        copy: If False, modify df in place instead of copying it first. Only
+            pass False for a frame the caller owns (not a slice and not
+            stored elsewhere, e.g. in session state)
     
     Returns:
         Prepared DataFrame
     """
-    df_display = df.copy()
+    df_display = df.copy() if copy else df
+    
+    cols = [col for col in numeric_columns if col in df_display.columns]
+    if not cols:
+        return df_display
     
-    for col in numeric_columns:
-        if col in df_display.columns:
-            df_display[col] = pd.to_numeric(df_display[col], errors='coerce').replace(0, None)
+    # Convert all numeric columns at once, then blank out zeros with one mask.
+    # where() keeps int columns that contain no zeros as int (e.g. Referensi Jumlah)
+    numeric = df_display[cols].apply(pd.to_numeric, errors='coerce')
+    df_display[cols] = numeric.where(numeric != 0)
     
     return df_display
 
 
+@lru_cache(maxsize=1)
 def get_column_config() -> Dict[str, Any]:
     """
     Get column configuration for st.data_editor
     
+    Built once and reused; st.data_editor deep-copies each entry before
+    applying its own changes, so the cached dict is never mutated.
+    
     Returns:
-        Dictionary with column configuration
+        Dictionary with column configuration (shared, do not modify)
     """
     return {
         "Kode Material": st.column_config.Column(
@@ -224,14 +461,19 @@ def get_column_config() -> Dict[str, Any]:
     }
 
 
-def render_footer():
-    """Render the footer with left and right text"""
-    from datetime import datetime
-    year = datetime.now().year
-    st.markdown(f"""
+@lru_cache(maxsize=2)
+def _footer_html(year: int) -> str:
+    """Build the footer HTML for a given copyright year"""
+    return f"""
     <div class="footer">
         <div class="footer-left">
             &copy; {year} SOSMATE | Developed by Construction Internship Team - Universitas Brawijaya
         </div>
     </div>
-    """, unsafe_allow_html=True)
\ No newline at end of file
+    """
+
+
+def render_footer():
+    """Render the footer with left and right text"""
+    # Keyed on the year so a long-running server still rolls over on 1 January
+    st.markdown(_footer_html(datetime.now().year), unsafe_allow_html=True)